@@ -6,9 +6,9 @@ Provides filesystem and shell access via MCP tools.
 Execute commands, read/write files, list directories, and inspect environment.
 
 Tools:
-  - execute_command(command, working_dir, timeout): Run shell command via subprocess
-  - read_file(path): Read file contents (max 100KB)
-  - write_file(path, content): Write/overwrite file
+  - execute_command(command, working_dir, timeout): Run shell command via asyncio subprocess
+  - read_file(path, offset, length): Read file contents, or a byte window of it (max 100KB)
+  - write_file(path, content, content_base64): Write/overwrite file (text or base64 bytes)
   - list_directory(path): List files and dirs with metadata
   - get_environment(): Return current dir, Python version, OS info
 
@@ -20,21 +20,47 @@ Usage:
 """
 
 import asyncio
+import base64
+import binascii
+import contextlib
+import inspect
 import json
+import mmap
 import os
-import subprocess
+import stat
 import sys
 import platform
+import signal
+import tempfile
 from pathlib import Path
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# orjson is optional; it encodes large results several times faster than json
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
 # Initialize server with metadata for MCP clients
 server = Server("shell-mcp-server")
 server.name = "shell-mcp-server"
 server.version = "0.1.0"
 
+# Reads at least this large are decoded straight from a read-only mmap;
+# below it the page-granularity setup costs more than the copy it saves
+_MMAP_THRESHOLD = 16384
+
+# Permission bits for newly created files, as open(path, 'w') would give them.
+# os.umask can only be read by setting it, so do that once at import.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
 
 def _validate_path(path: str) -> bool:
     """Validate that a path exists and is within reasonable bounds.
@@ -50,9 +76,12 @@ def _validate_path(path: str) -> bool:
     return True
 
 
-def _execute_command(command: str, working_dir: str = ".", timeout: int = 30) -> dict:
+async def _execute_command(command: str, working_dir: str = ".", timeout: int = 30) -> dict:
     """Execute a shell command and return stdout, stderr, and return code.
     
+    Runs the child via asyncio so the event loop keeps serving other tool
+    calls while the command is in flight.
+    
     Args:
         command: Shell command to execute
         working_dir: Working directory for command execution (default: ".")
@@ -63,29 +92,34 @@ def _execute_command(command: str, working_dir: str = ".", timeout: int = 30) ->
     
     Security note: Runs with the same permissions as the server process.
     """
-    if not _validate_path(working_dir) and working_dir != ".":
-        if not os.path.exists(working_dir):
-            return {
-                "stdout": "",
-                "stderr": f"Invalid working_dir: {working_dir}",
-                "returncode": 1
-            }
-    
     try:
-        result = subprocess.run(
+        proc = await asyncio.create_subprocess_shell(
             command,
-            shell=True,
             cwd=working_dir,
-            capture_output=True,
-            text=True,
-            timeout=timeout
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own process group, so a timeout can kill everything the shell started
+            start_new_session=True
         )
+    except (FileNotFoundError, NotADirectoryError):
+        # Raised by the chdir into cwd, so no separate existence check is needed
+        return {
+            "stdout": "",
+            "stderr": f"Invalid working_dir: {working_dir}",
+            "returncode": 1
+        }
+    except Exception as e:
         return {
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode
+            "stdout": "",
+            "stderr": f"Command execution failed: {str(e)}",
+            "returncode": 1
         }
-    except subprocess.TimeoutExpired:
+    
+    finished = False
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        finished = True
+    except asyncio.TimeoutError:
         return {
             "stdout": "",
             "stderr": f"Command timed out after {timeout} seconds",
@@ -97,43 +131,111 @@ def _execute_command(command: str, working_dir: str = ".", timeout: int = 30) ->
             "stderr": f"Command execution failed: {str(e)}",
             "returncode": 1
         }
+    finally:
+        # Timed out, cancelled by the client or failed: kill the shell and any
+        # children it started, which would otherwise keep the pipes open
+        if not finished:
+            _kill_process_group(proc)
+            await proc.wait()
+    
+    return {
+        "stdout": stdout.decode("utf-8", errors="replace"),
+        "stderr": stderr.decode("utf-8", errors="replace"),
+        "returncode": proc.returncode
+    }
+
+
+def _kill_process_group(proc) -> None:
+    """SIGKILL proc and its process group (just proc where there are no groups)."""
+    if hasattr(os, "killpg"):
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    elif proc.returncode is None:
+        proc.kill()
 
 
-def _read_file(path: str, max_size: int = 102400) -> dict:
-    """Read file contents.
+def _decode_utf8_window(data, truncated: bool, mid_file: bool) -> tuple:
+    """Decode a UTF-8 byte window, returning (text, bytes_skipped, bytes_consumed).
+    
+    If the window starts (mid_file) inside a multi-byte character, up to 3
+    leading continuation bytes are skipped. If it was cut short of EOF in
+    the middle of one, the partial trailing bytes are dropped rather than
+    failing.
+    """
+    skipped = 0
+    if mid_file:
+        while skipped < min(3, len(data)) and 0x80 <= data[skipped] <= 0xBF:
+            skipped += 1
+    # Release every slice before returning or raising; a live slice of an
+    # mmap-backed view would stop the caller from closing the mmap
+    with memoryview(data)[skipped:] as window:
+        try:
+            return str(window, 'utf-8'), skipped, len(window)
+        except UnicodeDecodeError as e:
+            if not truncated or e.end != len(window) or len(window) - e.start > 3:
+                raise
+            with window[:e.start] as head:
+                return str(head, 'utf-8'), skipped, e.start
+
+
+def _read_file(path: str, offset: int = 0, length: int | None = None, max_size: int = 102400) -> dict:
+    """Read file contents, optionally just a byte window of the file.
     
     Args:
         path: File path to read
-        max_size: Maximum file size to read (default: 100KB)
+        offset: Byte offset to start reading from (default: 0)
+        length: Maximum number of bytes to read (default: to end of file)
+        max_size: Maximum number of bytes returned in one call (default: 100KB)
     
     Returns:
-        Dict with 'content' key (str) or 'error' key
+        Dict with 'content' (str), 'offset', 'bytes_read' and 'size' keys, or 'error' key
     
     Security note: Enforces maximum read size to prevent memory issues.
     """
     if not _validate_path(path):
         return {"error": f"Invalid path: {path}"}
     
+    if offset < 0 or (length is not None and length < 0):
+        return {"error": "offset and length must be non-negative"}
+    
     try:
         file_path = Path(path)
         
-        # Check if file exists
-        if not file_path.exists():
+        # One stat() answers existence, file type and size
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             return {"error": f"File not found: {path}"}
         
         # Check if it's a file (not directory)
-        if not file_path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             return {"error": f"Path is not a file: {path}"}
         
-        # Check file size
-        file_size = file_path.stat().st_size
-        if file_size > max_size:
-            return {"error": f"File too large: {file_size} bytes (max {max_size})"}
+        # Check the size of the requested window
+        file_size = st.st_size
+        start = min(offset, file_size)
+        end = file_size if length is None else min(file_size, start + length)
+        window = end - start
+        if window > max_size:
+            return {"error": f"File too large: {window} bytes (max {max_size}). Use offset/length to read part of it"}
+        
+        # Read and decode only the requested bytes
+        truncated = end < file_size
+        if window >= _MMAP_THRESHOLD:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm)[start:end] as view:
+                    content, skipped, bytes_read = _decode_utf8_window(view, truncated, start > 0)
+        else:
+            with open(file_path, 'rb') as f:
+                f.seek(start)
+                content, skipped, bytes_read = _decode_utf8_window(f.read(window), truncated, start > 0)
         
-        # Read and return content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return {"content": content}
+        # Match the newline translation of text-mode open()
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # offset is where the returned text starts, after any skipped partial character
+        return {"content": content, "offset": start + skipped, "bytes_read": bytes_read, "size": file_size}
     
     except UnicodeDecodeError:
         return {"error": f"File is not valid UTF-8 text: {path}"}
@@ -141,12 +243,72 @@ def _read_file(path: str, max_size: int = 102400) -> dict:
         return {"error": f"Read failed: {str(e)}"}
 
 
-def _write_file(path: str, content: str) -> dict:
+def _write_all(fd: int, data: bytes) -> None:
+    """os.write data to fd in full, without a buffered file object."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_bytes_atomic(file_path: Path, data: bytes) -> None:
+    """Replace file_path with data via a temp file, fsync and rename.
+    
+    Symlinks are resolved first so the link's target is replaced, not the
+    link. A crash mid-write leaves either the old or the new contents, never
+    a truncated file. Keeps the target's permission bits (and owner, where
+    allowed) if it already exists. Hard-linked files, and files in a
+    directory we can't create the temp file in, are overwritten in place
+    so the links and the write still work.
+    """
+    real_path = os.path.realpath(file_path)
+    try:
+        st = os.stat(real_path)
+    except FileNotFoundError:
+        st = None
+    
+    def write_in_place():
+        fd = os.open(real_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+    
+    if st is not None and st.st_nlink > 1:
+        write_in_place()
+        return
+    
+    directory, name = os.path.split(real_path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    except PermissionError:
+        write_in_place()
+        return
+    
+    try:
+        try:
+            _write_all(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if st is not None:
+            with contextlib.suppress(OSError):
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode) if st is not None else _NEW_FILE_MODE)
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _write_file(path: str, content: str = "", content_base64: str | None = None) -> dict:
     """Write content to file (creates or overwrites).
     
     Args:
         path: File path to write
-        content: Content to write (str)
+        content: Content to write (str), stored as UTF-8
+        content_base64: Raw bytes to write, base64-encoded. Takes precedence
+            over content and allows binary files.
     
     Returns:
         Dict with 'success' key (bool) and optional 'error' key
@@ -156,6 +318,16 @@ def _write_file(path: str, content: str) -> dict:
     if not _validate_path(path):
         return {"success": False, "error": f"Invalid path: {path}"}
     
+    if content_base64 is not None:
+        try:
+            data = base64.b64decode(content_base64, validate=True)
+        except (binascii.Error, TypeError, ValueError) as e:
+            return {"success": False, "error": f"Invalid base64 content: {str(e)}"}
+    elif isinstance(content, str):
+        data = content.encode('utf-8')
+    else:
+        return {"success": False, "error": f"Write failed: content must be a string, not {type(content).__name__}"}
+    
     try:
         file_path = Path(path)
         
@@ -163,8 +335,7 @@ def _write_file(path: str, content: str) -> dict:
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Write file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        _write_bytes_atomic(file_path, data)
         
         return {"success": True, "path": str(file_path.absolute())}
     
@@ -181,184 +352,208 @@ def _list_directory(path: str = ".") -> dict:
     Returns:
         Dict with 'entries' key (list of dicts with name, type, size) or 'error' key
     """
-    if path != "." and not _validate_path(path):
-        if not os.path.exists(path):
-            return {"error": f"Invalid path: {path}"}
-    
     try:
         dir_path = Path(path)
         
-        if not dir_path.exists():
-            return {"error": f"Directory not found: {path}"}
-        
-        if not dir_path.is_dir():
-            return {"error": f"Path is not a directory: {path}"}
-        
+        # scandir() itself reports a missing path or a non-directory
         entries = []
-        for item in dir_path.iterdir():
-            try:
-                stat = item.stat()
-                entries.append({
-                    "name": item.name,
-                    "type": "dir" if item.is_dir() else "file",
-                    "size": stat.st_size if item.is_file() else None,
-                    "modified": stat.st_mtime
-                })
-            except (OSError, PermissionError):
-                # Skip files we can't stat (permissions, etc)
-                entries.append({
-                    "name": item.name,
-                    "type": "dir" if item.is_dir() else "file",
-                    "size": None,
-                    "modified": None,
-                    "error": "Permission denied or inaccessible"
-                })
+        # DirEntry carries the file type from the directory read itself,
+        # so only the stat() for size/mtime costs a syscall per entry
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                is_dir = entry.is_dir()
+                try:
+                    st = entry.stat()
+                    entries.append({
+                        "name": entry.name,
+                        "type": "dir" if is_dir else "file",
+                        "size": st.st_size if entry.is_file() else None,
+                        "modified": st.st_mtime
+                    })
+                except (OSError, PermissionError):
+                    # Skip files we can't stat (permissions, etc)
+                    entries.append({
+                        "name": entry.name,
+                        "type": "dir" if is_dir else "file",
+                        "size": None,
+                        "modified": None,
+                        "error": "Permission denied or inaccessible"
+                    })
         
         return {
             "path": str(dir_path.absolute()),
             "entries": sorted(entries, key=lambda x: x["name"])
         }
     
+    except FileNotFoundError:
+        return {"error": f"Directory not found: {path}"}
+    except NotADirectoryError:
+        return {"error": f"Path is not a directory: {path}"}
     except Exception as e:
         return {"error": f"List failed: {str(e)}"}
 
 
+# Platform details can't change while the server runs, and some platform.*
+# calls are slow (uname, registry lookups), so gather them once at import
+_ENV_STATIC = {
+    "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+    "os_name": platform.system(),
+    "os_version": platform.release(),
+    "platform": sys.platform,
+    "arch": platform.machine()
+}
+
+
 def _get_environment() -> dict:
     """Return current environment information.
     
     Returns:
         Dict with cwd, python_version, os_name, os_version, sys_platform
     """
-    return {
-        "cwd": os.getcwd(),
-        "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
-        "os_name": platform.system(),
-        "os_version": platform.release(),
-        "platform": sys.platform,
-        "arch": platform.machine()
-    }
+    return {"cwd": os.getcwd(), **_ENV_STATIC}
 
 
 # Register tools with MCP server
 
-@server.list_tools()
-async def list_tools():
-    """List all available tools."""
-    return [
-        Tool(
-            name="execute_command",
-            description="Execute a shell command",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "command": {
-                        "type": "string",
-                        "description": "Shell command to execute"
-                    },
-                    "working_dir": {
-                        "type": "string",
-                        "description": "Working directory for command (default: .)",
-                        "default": "."
-                    },
-                    "timeout": {
-                        "type": "integer",
-                        "description": "Command timeout in seconds (default: 30)",
-                        "default": 30
-                    }
+# Built once at import; list_tools hands back the same list every call
+_TOOLS = [
+    Tool(
+        name="execute_command",
+        description="Execute a shell command",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "command": {
+                    "type": "string",
+                    "description": "Shell command to execute"
                 },
-                "required": ["command"]
-            }
-        ),
-        Tool(
-            name="read_file",
-            description="Read file contents (max 100KB)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "File path to read"
-                    }
+                "working_dir": {
+                    "type": "string",
+                    "description": "Working directory for command (default: .)",
+                    "default": "."
                 },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="write_file",
-            description="Write content to file (creates or overwrites)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "File path to write"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Content to write"
-                    }
+                "timeout": {
+                    "type": "integer",
+                    "description": "Command timeout in seconds (default: 30)",
+                    "default": 30
+                }
+            },
+            "required": ["command"]
+        }
+    ),
+    Tool(
+        name="read_file",
+        description="Read file contents (max 100KB per call; use offset/length to page through larger files)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "File path to read"
                 },
-                "required": ["path", "content"]
-            }
-        ),
-        Tool(
-            name="list_directory",
-            description="List directory contents with metadata",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Directory path (default: .)",
-                        "default": "."
-                    }
+                "offset": {
+                    "type": "integer",
+                    "description": "Byte offset to start reading from (default: 0)",
+                    "default": 0
+                },
+                "length": {
+                    "type": "integer",
+                    "description": "Maximum number of bytes to read (default: to end of file)"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="write_file",
+        description="Write content to file (creates or overwrites)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "File path to write"
+                },
+                "content": {
+                    "type": "string",
+                    "description": "Text content to write (UTF-8)"
+                },
+                "content_base64": {
+                    "type": "string",
+                    "description": "Base64-encoded bytes to write instead of content (for binary files)"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    Tool(
+        name="list_directory",
+        description="List directory contents with metadata",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Directory path (default: .)",
+                    "default": "."
                 }
             }
-        ),
-        Tool(
-            name="get_environment",
-            description="Get current working directory, Python version, and OS info",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        )
-    ]
+        }
+    ),
+    Tool(
+        name="get_environment",
+        description="Get current working directory, Python version, and OS info",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+]
+
+
+# Tool name -> handler taking the raw arguments dict. A handler returns either
+# the result dict or an awaitable that resolves to it.
+_DISPATCH = {
+    "execute_command": lambda args: _execute_command(
+        command=args.get("command", ""),
+        working_dir=args.get("working_dir", "."),
+        timeout=args.get("timeout", 30)
+    ),
+    # Disk I/O runs on a worker thread so slow filesystems don't stall the loop
+    "read_file": lambda args: asyncio.to_thread(
+        _read_file,
+        path=args.get("path", ""),
+        offset=args.get("offset", 0),
+        length=args.get("length")
+    ),
+    "write_file": lambda args: asyncio.to_thread(
+        _write_file,
+        path=args.get("path", ""),
+        content=args.get("content", ""),
+        content_base64=args.get("content_base64")
+    ),
+    "list_directory": lambda args: _list_directory(path=args.get("path", ".")),
+    "get_environment": lambda args: _get_environment(),
+}
+
+
+@server.list_tools()
+async def list_tools():
+    """List all available tools."""
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Call a tool by name with arguments."""
-    
-    if name == "execute_command":
-        result = _execute_command(
-            command=arguments.get("command", ""),
-            working_dir=arguments.get("working_dir", "."),
-            timeout=arguments.get("timeout", 30)
-        )
-        return [TextContent(type="text", text=json.dumps(result))]
-    
-    elif name == "read_file":
-        result = _read_file(path=arguments.get("path", ""))
-        return [TextContent(type="text", text=json.dumps(result))]
-    
-    elif name == "write_file":
-        result = _write_file(
-            path=arguments.get("path", ""),
-            content=arguments.get("content", "")
-        )
-        return [TextContent(type="text", text=json.dumps(result))]
-    
-    elif name == "list_directory":
-        result = _list_directory(path=arguments.get("path", "."))
-        return [TextContent(type="text", text=json.dumps(result))]
-    
-    elif name == "get_environment":
-        result = _get_environment()
-        return [TextContent(type="text", text=json.dumps(result))]
-    
+    handler = _DISPATCH.get(name)
+    if handler is None:
+        result = {"error": f"Unknown tool: {name}"}
     else:
-        return [TextContent(type="text", text=json.dumps({"error": f"Unknown tool: {name}"}))]
+        result = handler(arguments)
+        if inspect.isawaitable(result):
+            result = await result
+    return [TextContent(type="text", text=_dumps(result))]
 
 
 async def main():
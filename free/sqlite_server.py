@@ -6,9 +6,10 @@ Provides SQLite database access via MCP tools.
 Execute queries, create/drop tables, insert rows, and introspect schema.
 
 Tools:
-  - execute_query(sql, db_path): Run any SQL query, returns rows as list of dicts
+  - execute_query(sql, db_path, limit): Run any SQL query, returns rows as list of dicts
   - create_table(table_name, schema, db_path): Create a table from schema string
   - insert_row(table_name, data, db_path): Insert a row (data as JSON string)
+  - insert_rows(table_name, data, db_path): Bulk insert rows (data as JSON array) in one transaction
   - get_schema(db_path): Get all table names and their column definitions
   - list_tables(db_path): List all table names in the database
   - drop_table(table_name, db_path): Drop a table (with confirmation check)
@@ -20,25 +21,69 @@ Usage:
 """
 
 import asyncio
+import atexit
+import contextlib
+import functools
+import itertools
 import json
 import os
 import sqlite3
 import re
+import threading
+import time
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# orjson is optional; it encodes large results several times faster than json
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
 # Initialize server with metadata for MCP clients
 server = Server("sqlite-mcp-server")
 server.name = "sqlite-mcp-server"
 server.version = "0.1.0"
 
+# Table names: letters, digits, underscore; must not start with a digit.
+# \Z rather than $ so a trailing newline is rejected too.
+_TABLE_NAME_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*\Z')
+
+# Rows pulled from the cursor per fetchmany() call in execute_query
+_FETCH_BATCH_SIZE = 1000
+
+# Encoded get_schema/list_tables responses keyed by (tool, db_path), served
+# for a short TTL and dropped as soon as this server changes the schema
+_SCHEMA_TOOLS = frozenset({"get_schema", "list_tables"})
+_SCHEMA_CACHE_TTL = 2.0
+_SCHEMA_CACHE: dict[tuple[str, str], tuple[float, str]] = {}
+
+# Open connections keyed by db_path, reused across tool calls.
+# Each connection has its own lock so calls from worker threads don't interleave.
+_CONN_CACHE: dict[str, sqlite3.Connection] = {}
+_CONN_LOCKS: dict[str, threading.Lock] = {}
+_CONN_CACHE_LOCK = threading.Lock()
+
+# Applied once when a connection is opened: WAL so readers don't block the
+# writer, NORMAL sync (safe under WAL) to avoid an fsync per commit, a 64MB
+# page cache, in-memory temp tables, and up to 256MB of the file mmap'd.
+# Best-effort: a read-only database can't switch to WAL but is still usable.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
 
 def _validate_table_name(name: str) -> bool:
     """Validate table name to prevent SQL injection."""
-    # Allow only alphanumeric, underscore, and letters
-    # Must start with letter or underscore
-    return bool(re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', name))
+    return _TABLE_NAME_RE.match(name) is not None
 
 
 def _validate_db_path(db_path: str) -> bool:
@@ -53,56 +98,130 @@ def _validate_db_path(db_path: str) -> bool:
 
 
 def _get_db_connection(db_path: str):
-    """Open a connection to the SQLite database.
+    """Return the cached connection for db_path, opening it on first use.
     
     Returns tuple: (conn, error_msg) where error_msg is None if successful.
+    Callers must use the connection inside _hold_connection() and must not
+    close it.
     """
     if not _validate_db_path(db_path):
         return None, f"Invalid db_path: {db_path}"
     
-    try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
+    conn = _CONN_CACHE.get(db_path)
+    if conn is not None:
         return conn, None
-    except sqlite3.Error as e:
-        return None, f"Database connection failed: {str(e)}"
+    
+    with _CONN_CACHE_LOCK:
+        conn = _CONN_CACHE.get(db_path)
+        if conn is not None:
+            return conn, None
+        conn = None
+        try:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            for pragma in _CONNECTION_PRAGMAS:
+                try:
+                    conn.execute(pragma)
+                except sqlite3.OperationalError:
+                    pass
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+        except sqlite3.Error as e:
+            if conn is not None:
+                conn.close()
+            return None, f"Database connection failed: {str(e)}"
+        _CONN_LOCKS[db_path] = threading.Lock()
+        _CONN_CACHE[db_path] = conn
+        return conn, None
+
+
+def _invalidate_schema_cache(db_path: str) -> None:
+    """Forget cached get_schema/list_tables responses for db_path."""
+    for tool in _SCHEMA_TOOLS:
+        _SCHEMA_CACHE.pop((tool, db_path), None)
+
+
+@contextlib.contextmanager
+def _hold_connection(conn: sqlite3.Connection, db_path: str):
+    """Hold the lock for a cached connection for the duration of a block.
+    
+    On the way out, on every path including exceptions that aren't
+    sqlite3.Error, an uncommitted transaction is rolled back so the next
+    call doesn't inherit it.
+    """
+    with _CONN_LOCKS[db_path]:
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+
+@atexit.register
+def _close_db_connections():
+    """Close every cached connection on interpreter shutdown."""
+    with _CONN_CACHE_LOCK:
+        for conn in _CONN_CACHE.values():
+            conn.close()
+        _CONN_CACHE.clear()
+        _CONN_LOCKS.clear()
 
 
-def _execute_query(sql: str, db_path: str = "data.db") -> dict:
+def _execute_query(sql: str, db_path: str = "data.db", limit: int | None = None) -> dict:
     """Execute a SQL query and return results.
     
     Args:
         sql: SQL query string (SELECT, INSERT, UPDATE, DELETE, etc.)
         db_path: Path to database file (default: "data.db")
+        limit: Maximum number of rows to return for SELECT queries (default: all)
     
     Returns:
-        Dict with 'rows' (list of dicts) and optional 'error' key
+        Dict with 'rows' (list of dicts), 'truncated' (bool) when limit cut the
+        result short, and optional 'error' key
     """
+    if limit is not None and limit < 0:
+        return {"error": "limit must be non-negative"}
+    
     conn, error = _get_db_connection(db_path)
     if error:
         return {"error": error}
     
-    try:
-        cursor = conn.cursor()
-        cursor.execute(sql)
-        
-        # For SELECT queries, fetch and return rows
-        if sql.strip().upper().startswith('SELECT'):
-            rows = cursor.fetchall()
-            # Convert Row objects to dicts
-            result_rows = [dict(row) for row in rows]
-            conn.close()
-            return {"rows": result_rows}
+    with _hold_connection(conn, db_path):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            
+            # Statements that produce rows (SELECT, WITH ... SELECT, PRAGMA,
+            # ... RETURNING) set cursor.description; no need to parse the SQL
+            if cursor.description is not None:
+                # Convert Row objects to dicts batch by batch, so the full
+                # list of Row objects never exists alongside the dicts
+                result_rows = []
+                while limit is None or len(result_rows) < limit:
+                    size = _FETCH_BATCH_SIZE if limit is None else min(_FETCH_BATCH_SIZE, limit - len(result_rows))
+                    batch = cursor.fetchmany(size)
+                    if not batch:
+                        break
+                    result_rows.extend(dict(row) for row in batch)
+                
+                truncated = limit is not None and len(result_rows) == limit and cursor.fetchone() is not None
+                
+                # Row-returning writes (INSERT ... RETURNING) still need committing
+                if conn.in_transaction:
+                    cursor.close()
+                    conn.commit()
+                
+                if truncated:
+                    return {"rows": result_rows, "truncated": True}
+                return {"rows": result_rows}
+            
+            # For INSERT, UPDATE, DELETE, commit and return affected rows.
+            # This path also runs DDL, so cached schema responses go stale.
+            conn.commit()
+            _invalidate_schema_cache(db_path)
+            affected = cursor.rowcount
+            return {"rows": [], "affected_rows": affected}
         
-        # For INSERT, UPDATE, DELETE, commit and return affected rows
-        conn.commit()
-        affected = cursor.rowcount
-        conn.close()
-        return {"rows": [], "affected_rows": affected}
-    
-    except sqlite3.Error as e:
-        conn.close()
-        return {"error": f"Query execution failed: {str(e)}"}
+        except sqlite3.Error as e:
+            return {"error": f"Query execution failed: {str(e)}"}
 
 
 def _create_table(table_name: str, schema: str, db_path: str = "data.db") -> dict:
@@ -123,18 +242,69 @@ def _create_table(table_name: str, schema: str, db_path: str = "data.db") -> dic
     if error:
         return {"error": error}
     
-    try:
-        cursor = conn.cursor()
-        # Use IF NOT EXISTS to avoid errors if table already exists
-        sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})"
-        cursor.execute(sql)
-        conn.commit()
-        conn.close()
-        return {"success": True, "message": f"Table '{table_name}' created successfully"}
+    with _hold_connection(conn, db_path):
+        try:
+            cursor = conn.cursor()
+            # Use IF NOT EXISTS to avoid errors if table already exists
+            sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})"
+            cursor.execute(sql)
+            conn.commit()
+            _invalidate_schema_cache(db_path)
+            return {"success": True, "message": f"Table '{table_name}' created successfully"}
+        
+        except sqlite3.Error as e:
+            return {"error": f"Table creation failed: {str(e)}"}
+
+
+@functools.lru_cache(maxsize=256)
+def _insert_sql(table_name: str, columns: tuple) -> str:
+    """Build the parameterized INSERT for a table and column tuple.
     
-    except sqlite3.Error as e:
-        conn.close()
-        return {"error": f"Table creation failed: {str(e)}"}
+    Memoized so repeat inserts reuse the identical SQL string, which lets
+    sqlite3's per-connection statement cache skip re-parsing it.
+    """
+    # Build parameterized INSERT to prevent injection
+    placeholders = ','.join(['?' for _ in columns])
+    col_names = ','.join(columns)
+    return f"INSERT INTO {table_name} ({col_names}) VALUES ({placeholders})"
+
+
+def _insert_many(table_name: str, rows: list, db_path: str) -> dict:
+    """Insert already-parsed rows in a single transaction.
+    
+    Every row must be a dict with the same set of keys.
+    
+    Returns:
+        Dict with 'inserted' (int) or 'error' key
+    """
+    if not rows:
+        return {"error": "No rows to insert"}
+    if not all(isinstance(row, dict) for row in rows):
+        return {"error": "Each row must be a JSON object of key/value pairs"}
+    
+    # Sorted so the same columns in any key order map to one cached statement
+    columns = tuple(sorted(rows[0].keys()))
+    column_set = set(columns)
+    if any(row.keys() != column_set for row in rows):
+        return {"error": "All rows must have the same keys"}
+    
+    conn, error = _get_db_connection(db_path)
+    if error:
+        return {"error": error}
+    
+    with _hold_connection(conn, db_path):
+        try:
+            cursor = conn.cursor()
+            
+            sql = _insert_sql(table_name, columns)
+            
+            # One statement, one commit for the whole batch
+            cursor.executemany(sql, [tuple(row[c] for c in columns) for row in rows])
+            conn.commit()
+            return {"inserted": len(rows)}
+        
+        except sqlite3.Error as e:
+            return {"error": f"Insert failed: {str(e)}"}
 
 
 def _insert_row(table_name: str, data: str, db_path: str = "data.db") -> dict:
@@ -156,28 +326,43 @@ def _insert_row(table_name: str, data: str, db_path: str = "data.db") -> dict:
     except json.JSONDecodeError as e:
         return {"error": f"Invalid JSON in data: {str(e)}"}
     
-    conn, error = _get_db_connection(db_path)
-    if error:
-        return {"error": error}
+    result = _insert_many(table_name, [data_dict], db_path)
+    if "error" in result:
+        return result
+    return {"success": True, "message": f"Row inserted into '{table_name}'"}
+
+
+def _insert_rows(table_name: str, data: str, db_path: str = "data.db") -> dict:
+    """Insert many rows into a table in a single transaction.
+    
+    Args:
+        table_name: Name of the table
+        data: JSON array of objects sharing the same keys
+              (e.g., '[{"name": "Alice", "age": 30}, {"name": "Bob", "age": 25}]')
+        db_path: Path to database file (default: "data.db")
+    
+    Returns:
+        Dict with 'success', 'inserted' (int) and optional 'error' key
+    """
+    if not _validate_table_name(table_name):
+        return {"error": f"Invalid table name: {table_name}"}
     
     try:
-        cursor = conn.cursor()
-        columns = list(data_dict.keys())
-        values = list(data_dict.values())
-        
-        # Build parameterized INSERT to prevent injection
-        placeholders = ','.join(['?' for _ in columns])
-        col_names = ','.join(columns)
-        sql = f"INSERT INTO {table_name} ({col_names}) VALUES ({placeholders})"
-        
-        cursor.execute(sql, values)
-        conn.commit()
-        conn.close()
-        return {"success": True, "message": f"Row inserted into '{table_name}'"}
+        rows = json.loads(data)
+    except json.JSONDecodeError as e:
+        return {"error": f"Invalid JSON in data: {str(e)}"}
     
-    except sqlite3.Error as e:
-        conn.close()
-        return {"error": f"Insert failed: {str(e)}"}
+    if not isinstance(rows, list):
+        return {"error": "data must be a JSON array of objects"}
+    
+    result = _insert_many(table_name, rows, db_path)
+    if "error" in result:
+        return result
+    return {
+        "success": True,
+        "inserted": result["inserted"],
+        "message": f"{result['inserted']} rows inserted into '{table_name}'"
+    }
 
 
 def _get_schema(db_path: str = "data.db") -> dict:
@@ -193,37 +378,37 @@ def _get_schema(db_path: str = "data.db") -> dict:
     if error:
         return {"error": error}
     
-    try:
-        cursor = conn.cursor()
-        # Get all tables from sqlite_master
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
-        
-        schema_info = []
-        for (table_name,) in tables:
-            # Get column info for each table
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-            col_defs = []
-            for col_id, col_name, col_type, not_null, default_val, pk in columns:
-                col_defs.append({
-                    "name": col_name,
-                    "type": col_type,
-                    "not_null": bool(not_null),
-                    "primary_key": bool(pk)
+    with _hold_connection(conn, db_path):
+        try:
+            cursor = conn.cursor()
+            # Every column of every table in one statement, instead of one
+            # PRAGMA table_info() round trip per table
+            cursor.execute(
+                "SELECT m.name, p.name, p.type, p.\"notnull\", p.pk "
+                "FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+                "WHERE m.type='table' ORDER BY m.name, p.cid"
+            )
+            
+            schema_info = []
+            for table_name, columns in itertools.groupby(cursor.fetchall(), key=lambda row: row[0]):
+                col_defs = []
+                for _, col_name, col_type, not_null, pk in columns:
+                    col_defs.append({
+                        "name": col_name,
+                        "type": col_type,
+                        "not_null": bool(not_null),
+                        "primary_key": bool(pk)
+                    })
+                
+                schema_info.append({
+                    "table": table_name,
+                    "columns": col_defs
                 })
             
-            schema_info.append({
-                "table": table_name,
-                "columns": col_defs
-            })
+            return {"schema": schema_info}
         
-        conn.close()
-        return {"schema": schema_info}
-    
-    except sqlite3.Error as e:
-        conn.close()
-        return {"error": f"Schema retrieval failed: {str(e)}"}
+        except sqlite3.Error as e:
+            return {"error": f"Schema retrieval failed: {str(e)}"}
 
 
 def _list_tables(db_path: str = "data.db") -> dict:
@@ -239,16 +424,15 @@ def _list_tables(db_path: str = "data.db") -> dict:
     if error:
         return {"error": error}
     
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-        tables = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return {"tables": tables}
-    
-    except sqlite3.Error as e:
-        conn.close()
-        return {"error": f"Table listing failed: {str(e)}"}
+    with _hold_connection(conn, db_path):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+            tables = [row[0] for row in cursor.fetchall()]
+            return {"tables": tables}
+        
+        except sqlite3.Error as e:
+            return {"error": f"Table listing failed: {str(e)}"}
 
 
 def _drop_table(table_name: str, db_path: str = "data.db") -> dict:
@@ -268,190 +452,238 @@ def _drop_table(table_name: str, db_path: str = "data.db") -> dict:
     if error:
         return {"error": error}
     
-    try:
-        cursor = conn.cursor()
-        # Check if table exists before dropping (confirmation check)
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,)
-        )
-        if not cursor.fetchone():
-            conn.close()
-            return {"error": f"Table '{table_name}' does not exist"}
+    with _hold_connection(conn, db_path):
+        try:
+            cursor = conn.cursor()
+            # Check if table exists before dropping (confirmation check)
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                (table_name,)
+            )
+            if not cursor.fetchone():
+                return {"error": f"Table '{table_name}' does not exist"}
+            
+            # Drop the table
+            sql = f"DROP TABLE {table_name}"
+            cursor.execute(sql)
+            conn.commit()
+            _invalidate_schema_cache(db_path)
+            return {"success": True, "message": f"Table '{table_name}' dropped successfully"}
         
-        # Drop the table
-        sql = f"DROP TABLE {table_name}"
-        cursor.execute(sql)
-        conn.commit()
-        conn.close()
-        return {"success": True, "message": f"Table '{table_name}' dropped successfully"}
-    
-    except sqlite3.Error as e:
-        conn.close()
-        return {"error": f"Drop failed: {str(e)}"}
+        except sqlite3.Error as e:
+            return {"error": f"Drop failed: {str(e)}"}
 
 
 # Register MCP tools
 # Each tool is defined with name, description, and input schema
 
-@server.list_tools()
-async def list_tools():
-    """List all available tools for the SQLite MCP server."""
-    return [
-        Tool(
-            name="execute_query",
-            description="Execute a SQL query (SELECT, INSERT, UPDATE, DELETE). Returns rows as list of dicts for SELECT queries.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sql": {
-                        "type": "string",
-                        "description": "SQL query to execute"
-                    },
-                    "db_path": {
-                        "type": "string",
-                        "description": "Path to database file (default: data.db)",
-                        "default": "data.db"
-                    }
+# Built once at import; list_tools hands back the same list every call
+_TOOLS = [
+    Tool(
+        name="execute_query",
+        description="Execute a SQL query (SELECT, INSERT, UPDATE, DELETE). Returns rows as list of dicts for SELECT queries.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql": {
+                    "type": "string",
+                    "description": "SQL query to execute"
                 },
-                "required": ["sql"]
-            }
-        ),
-        Tool(
-            name="create_table",
-            description="Create a new table with specified column definitions",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {
-                        "type": "string",
-                        "description": "Name of the table to create"
-                    },
-                    "schema": {
-                        "type": "string",
-                        "description": "Column definitions (e.g., 'id INTEGER PRIMARY KEY, name TEXT, age INTEGER')"
-                    },
-                    "db_path": {
-                        "type": "string",
-                        "description": "Path to database file (default: data.db)",
-                        "default": "data.db"
-                    }
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
                 },
-                "required": ["table_name", "schema"]
-            }
-        ),
-        Tool(
-            name="insert_row",
-            description="Insert a row into a table",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {
-                        "type": "string",
-                        "description": "Name of the table"
-                    },
-                    "data": {
-                        "type": "string",
-                        "description": "JSON string of key/value pairs (e.g., '{\"name\": \"Alice\", \"age\": 30}')"
-                    },
-                    "db_path": {
-                        "type": "string",
-                        "description": "Path to database file (default: data.db)",
-                        "default": "data.db"
-                    }
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of rows to return for SELECT queries (default: all)"
+                }
+            },
+            "required": ["sql"]
+        }
+    ),
+    Tool(
+        name="create_table",
+        description="Create a new table with specified column definitions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table to create"
                 },
-                "required": ["table_name", "data"]
-            }
-        ),
-        Tool(
-            name="get_schema",
-            description="Get complete schema information for all tables in the database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_path": {
-                        "type": "string",
-                        "description": "Path to database file (default: data.db)",
-                        "default": "data.db"
-                    }
+                "schema": {
+                    "type": "string",
+                    "description": "Column definitions (e.g., 'id INTEGER PRIMARY KEY, name TEXT, age INTEGER')"
+                },
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
+                }
+            },
+            "required": ["table_name", "schema"]
+        }
+    ),
+    Tool(
+        name="insert_row",
+        description="Insert a row into a table",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table"
+                },
+                "data": {
+                    "type": "string",
+                    "description": "JSON string of key/value pairs (e.g., '{\"name\": \"Alice\", \"age\": 30}')"
+                },
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
+                }
+            },
+            "required": ["table_name", "data"]
+        }
+    ),
+    Tool(
+        name="insert_rows",
+        description="Insert many rows into a table in a single transaction",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table"
+                },
+                "data": {
+                    "type": "string",
+                    "description": "JSON array of objects with the same keys (e.g., '[{\"name\": \"Alice\"}, {\"name\": \"Bob\"}]')"
+                },
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
+                }
+            },
+            "required": ["table_name", "data"]
+        }
+    ),
+    Tool(
+        name="get_schema",
+        description="Get complete schema information for all tables in the database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
                 }
             }
-        ),
-        Tool(
-            name="list_tables",
-            description="List all table names in the database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "db_path": {
-                        "type": "string",
-                        "description": "Path to database file (default: data.db)",
-                        "default": "data.db"
-                    }
+        }
+    ),
+    Tool(
+        name="list_tables",
+        description="List all table names in the database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
                 }
             }
-        ),
-        Tool(
-            name="drop_table",
-            description="Drop a table from the database (checks existence first)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {
-                        "type": "string",
-                        "description": "Name of the table to drop"
-                    },
-                    "db_path": {
-                        "type": "string",
-                        "description": "Path to database file (default: data.db)",
-                        "default": "data.db"
-                    }
+        }
+    ),
+    Tool(
+        name="drop_table",
+        description="Drop a table from the database (checks existence first)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {
+                    "type": "string",
+                    "description": "Name of the table to drop"
                 },
-                "required": ["table_name"]
-            }
-        )
-    ]
+                "db_path": {
+                    "type": "string",
+                    "description": "Path to database file (default: data.db)",
+                    "default": "data.db"
+                }
+            },
+            "required": ["table_name"]
+        }
+    )
+]
+
+
+# Tool name -> handler taking the raw arguments dict
+_DISPATCH = {
+    "execute_query": lambda args: _execute_query(
+        args.get("sql"),
+        args.get("db_path", "data.db"),
+        args.get("limit")
+    ),
+    "create_table": lambda args: _create_table(
+        args.get("table_name"),
+        args.get("schema"),
+        args.get("db_path", "data.db")
+    ),
+    "insert_row": lambda args: _insert_row(
+        args.get("table_name"),
+        args.get("data"),
+        args.get("db_path", "data.db")
+    ),
+    "insert_rows": lambda args: _insert_rows(
+        args.get("table_name"),
+        args.get("data"),
+        args.get("db_path", "data.db")
+    ),
+    "get_schema": lambda args: _get_schema(args.get("db_path", "data.db")),
+    "list_tables": lambda args: _list_tables(args.get("db_path", "data.db")),
+    "drop_table": lambda args: _drop_table(
+        args.get("table_name"),
+        args.get("db_path", "data.db")
+    ),
+}
+
+
+@server.list_tools()
+async def list_tools():
+    """List all available tools for the SQLite MCP server."""
+    return _TOOLS
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Route tool calls to appropriate handler functions."""
     try:
-        if name == "execute_query":
-            result = _execute_query(
-                arguments.get("sql"),
-                arguments.get("db_path", "data.db")
-            )
-        elif name == "create_table":
-            result = _create_table(
-                arguments.get("table_name"),
-                arguments.get("schema"),
-                arguments.get("db_path", "data.db")
-            )
-        elif name == "insert_row":
-            result = _insert_row(
-                arguments.get("table_name"),
-                arguments.get("data"),
-                arguments.get("db_path", "data.db")
-            )
-        elif name == "get_schema":
-            result = _get_schema(arguments.get("db_path", "data.db"))
-        elif name == "list_tables":
-            result = _list_tables(arguments.get("db_path", "data.db"))
-        elif name == "drop_table":
-            result = _drop_table(
-                arguments.get("table_name"),
-                arguments.get("db_path", "data.db")
-            )
-        else:
+        cache_key = None
+        if name in _SCHEMA_TOOLS:
+            cache_key = (name, arguments.get("db_path", "data.db"))
+            cached = _SCHEMA_CACHE.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < _SCHEMA_CACHE_TTL:
+                return [TextContent(type="text", text=cached[1])]
+        
+        handler = _DISPATCH.get(name)
+        if handler is None:
             result = {"error": f"Unknown tool: {name}"}
+        else:
+            result = handler(arguments)
         
-        return [TextContent(type="text", text=json.dumps(result))]
+        text = _dumps(result)
+        if cache_key is not None and "error" not in result:
+            _SCHEMA_CACHE[cache_key] = (time.monotonic(), text)
+        return [TextContent(type="text", text=text)]
     
     except Exception as e:
         # Catch any unexpected errors and return as JSON
         error_result = {"error": f"Tool execution error: {str(e)}"}
-        return [TextContent(type="text", text=json.dumps(error_result))]
+        return [TextContent(type="text", text=_dumps(error_result))]
 
 
 async def main():
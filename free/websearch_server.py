@@ -13,9 +13,9 @@ Tools:
 
 Features:
   - Primary: DuckDuckGo lite HTML scraping (no API key required)
-  - Optional: Brave API fallback (requires BRAVE_API_KEY env var)
+  - Optional: Brave API, raced against DuckDuckGo (requires BRAVE_API_KEY env var)
   - Graceful degradation if DuckDuckGo is blocked
-  - 10 second timeout on all requests
+  - 10 second timeout on all requests (3s to connect, 7s between reads)
   - JSON-serializable output
 
 Usage:
@@ -23,15 +23,36 @@ Usage:
 """
 
 import asyncio
+import concurrent.futures
+import contextlib
+import io
 import json
+import multiprocessing
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
+import time
+from collections import OrderedDict
+import aiohttp
+import lxml.html
+from lxml import etree
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# orjson is optional; the fallback still skips indentation and ASCII escaping
+# so responses stay on json's C encoder and as small as possible
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+# json's C string encoder: quotes and escapes one str without ASCII escaping
+_json_str = json.encoder.encode_basestring
+
 # Initialize server with metadata for MCP clients
 server = Server("websearch-mcp-server")
 server.name = "websearch-mcp-server"
@@ -41,113 +62,492 @@ server.version = "0.1.0"
 DUCKDUCKGO_URL = "https://html.duckduckgo.com/html/"
 BRAVE_API_URL = "https://api.search.brave.com/res/v1/web/search"
 BRAVE_API_KEY = os.getenv("BRAVE_API_KEY")
+# The key is only read at startup, so decide the engine and Brave headers once
+_BRAVE_ENABLED = bool(BRAVE_API_KEY)
+_ACTIVE_ENGINE = "brave" if _BRAVE_ENABLED else "duckduckgo"
+_BRAVE_HEADERS = {
+    "Accept": "application/json",
+    "X-Subscription-Token": BRAVE_API_KEY or ""
+}
 REQUEST_TIMEOUT = 10
+# Fail fast on hosts that don't accept a connection, while still allowing
+# slow bodies; retries and all included, a request stays within REQUEST_TIMEOUT
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 7
 DEFAULT_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+_WS_RE = re.compile(r'\s+')
+# fetch_page reads at most max_chars * _PAGE_BYTES_PER_CHAR bytes of HTML,
+# and never more than _MAX_PAGE_BYTES
+_PAGE_BYTES_PER_CHAR = 50
+_MAX_PAGE_BYTES = 2_000_000
+# Content types fetch_page will download and extract text from
+_TEXT_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml", "text/plain"})
+# HTML at least this large is parsed in a worker process so concurrent fetches
+# don't contend for the GIL; below it the pickling round trip costs more
+_PROCESS_PARSE_THRESHOLD = 50_000
+
+# After a 429 from Brave, skip it for Retry-After seconds (or this default)
+_BRAVE_RATE_LIMIT_COOLDOWN = 1.0
+_brave_blocked_until = 0.0
+
+# Transient gateway errors worth retrying, with exponential backoff
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_MAX_RETRIES = 2
+_RETRY_BACKOFF = 0.3
+
+# Search results and fetched page text, keyed by (engine, query, max_results)
+# and ("page", url, max_chars). Only touched from the event loop thread.
+_CACHE_MAXSIZE = 512
+_CACHE_TTL = 300
+_CACHE: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+
+# Fetches currently in progress, by the same keys, so concurrent identical
+# requests wait on one outbound call
+_INFLIGHT: dict[tuple, asyncio.Task] = {}
+
+# Validators and extracted text of fetched pages, keyed by (url, max_chars),
+# for conditional GETs once the entry above has expired: (etag, last_modified, text)
+_HTTP_CACHE_MAXSIZE = 256
+_HTTP_CACHE: OrderedDict[tuple, tuple[str | None, str | None, str]] = OrderedDict()
+
+# One pooled session for every outbound request, so repeat calls to the same
+# host reuse a kept-alive connection instead of redoing DNS, TCP and TLS.
+# Created lazily because aiohttp sessions must belong to a running loop.
+_SESSION: aiohttp.ClientSession | None = None
+
+# Worker processes for parsing large pages, started on first use. Capped,
+# and started via forkserver/spawn because forking a process that already
+# runs threads (stdio reader, to_thread workers) can deadlock.
+_PARSE_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+_PARSE_POOL: concurrent.futures.ProcessPoolExecutor | None = None
+
+
+def _accept_encoding() -> str:
+    """gzip and deflate, plus br / zstd when aiohttp can decode them here."""
+    try:
+        from aiohttp import compression_utils
+    except ImportError:
+        return "gzip, deflate"
+    encodings = ["gzip", "deflate"]
+    if getattr(compression_utils, "HAS_BROTLI", False):
+        encodings.append("br")
+    if getattr(compression_utils, "HAS_ZSTD", False):
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(
+                total=REQUEST_TIMEOUT,
+                sock_connect=CONNECT_TIMEOUT,
+                sock_read=READ_TIMEOUT
+            ),
+            headers={"User-Agent": DEFAULT_USER_AGENT, "Accept-Encoding": _accept_encoding()}
+        )
+    return _SESSION
+
+
+def _get_parse_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Return the shared parse process pool, creating it on first use."""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _PARSE_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=_PARSE_POOL_MAX_WORKERS,
+            mp_context=multiprocessing.get_context(method)
+        )
+    return _PARSE_POOL
+
+
+def _discard_parse_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Drop a broken parse pool so the next _get_parse_pool() builds a new one."""
+    global _PARSE_POOL
+    if _PARSE_POOL is pool:
+        _PARSE_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _shutdown_parse_pool() -> None:
+    """Stop the parse worker processes if any were started."""
+    if _PARSE_POOL is not None:
+        _PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+async def _close_session() -> None:
+    """Close the shared client session if one was opened."""
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+
+
+def _can_retry(attempt: int, deadline: float) -> bool:
+    """Whether another attempt is allowed and its backoff fits before deadline."""
+    if attempt >= _MAX_RETRIES:
+        return False
+    return time.monotonic() + _RETRY_BACKOFF * (2 ** attempt) < deadline
+
+
+@contextlib.asynccontextmanager
+async def _get(url: str, **kwargs):
+    """GET url on the shared session, retrying connection failures and 502/503/504.
+    
+    Timeouts are not retried, and every attempt (plus reading the final
+    body) shares one REQUEST_TIMEOUT deadline. Yields the final aiohttp
+    response; its body is released on exit.
+    """
+    session = _get_session()
+    deadline = time.monotonic() + REQUEST_TIMEOUT
+    for attempt in range(_MAX_RETRIES + 1):
+        timeout = aiohttp.ClientTimeout(
+            total=deadline - time.monotonic(),
+            sock_connect=CONNECT_TIMEOUT,
+            sock_read=READ_TIMEOUT
+        )
+        try:
+            response = await session.get(url, timeout=timeout, **kwargs)
+        except aiohttp.ServerTimeoutError:
+            # A connect or read timeout would most likely just time out again
+            raise
+        except aiohttp.ClientConnectionError:
+            if not _can_retry(attempt, deadline):
+                raise
+        else:
+            if response.status not in _RETRY_STATUSES or not _can_retry(attempt, deadline):
+                break
+            response.release()
+        await asyncio.sleep(_RETRY_BACKOFF * (2 ** attempt))
+    
+    try:
+        yield response
+    finally:
+        response.release()
+
+
+def _cache_get(key: tuple):
+    """Return the cached value for key, or None if missing or expired."""
+    entry = _CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, value = entry
+    if time.monotonic() - stored_at > _CACHE_TTL:
+        del _CACHE[key]
+        return None
+    _CACHE.move_to_end(key)
+    return value
+
+
+def _cache_set(key: tuple, value) -> None:
+    """Store value under key, evicting the least recently used entries."""
+    _CACHE[key] = (time.monotonic(), value)
+    _CACHE.move_to_end(key)
+    while len(_CACHE) > _CACHE_MAXSIZE:
+        _CACHE.popitem(last=False)
+
+
+def _finish_inflight(key: tuple, task: asyncio.Task) -> None:
+    """Done-callback for a shared fetch: drop it from _INFLIGHT, cache a result."""
+    _INFLIGHT.pop(key, None)
+    if not task.cancelled() and task.exception() is None and task.result():
+        _cache_set(key, task.result())
+
+
+async def _cached(key: tuple, fetch):
+    """Return the cached value for key, or await fetch() and cache the result.
+    
+    Concurrent misses on the same key share a single fetch instead of each
+    issuing the same request. Empty results and exceptions are not cached,
+    so a blocked or failing backend is retried on the next call.
+    """
+    value = _cache_get(key)
+    if value is not None:
+        return value
+    
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda done: _finish_inflight(key, done))
+    
+    # shield() so one caller being cancelled doesn't abort the shared fetch
+    return await asyncio.shield(task)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# DuckDuckGo result fields, compiled once. normalize-space() yields "" when
+# the element is missing, so no per-field None checks are needed.
+# smart_strings=False returns plain str that doesn't pin the parsed tree.
+_XP_IS_RESULT_BODY = etree.XPath(f"boolean(self::div[{_has_class('result__body')}])")
+_XP_RESULT_TITLE = etree.XPath(f"normalize-space(.//*[{_has_class('result__title')}])", smart_strings=False)
+_XP_RESULT_URL = etree.XPath(f"normalize-space(.//a[{_has_class('result__url')}])", smart_strings=False)
+_XP_RESULT_SNIPPET = etree.XPath(f"normalize-space(.//a[{_has_class('result__snippet')}])", smart_strings=False)
 
 
 def get_active_search_engine() -> str:
     """Return which search engine is currently active."""
-    if BRAVE_API_KEY:
-        return "brave"
-    return "duckduckgo"
+    return _ACTIVE_ENGINE
 
 
-def search_duckduckgo(query: str, max_results: int = 5) -> list:
-    """
-    Search using DuckDuckGo lite HTML scraping (no API key required).
-    Returns list of {title, url, snippet} dicts.
+def _parse_duckduckgo_results(page: bytes, charset: str | None, max_results: int) -> list:
+    """Pull (title, url, snippet) tuples out of a DuckDuckGo HTML results page.
+    
+    Parses incrementally, looking only at closed <div>s, and stops after
+    max_results result bodies so the rest of the page is never parsed.
     """
+    results = []
+    if max_results <= 0:
+        return results
+    
+    seen = 0
     try:
-        headers = {"User-Agent": DEFAULT_USER_AGENT}
-        params = {"q": query, "kl": "uk-en"}
+        divs = etree.iterparse(io.BytesIO(page), events=("end",), tag="div", html=True, encoding=charset)
+    except LookupError:
+        # Charset label lxml doesn't know; let it detect the encoding itself
+        divs = etree.iterparse(io.BytesIO(page), events=("end",), tag="div", html=True)
+    for _, body in divs:
+        if not _XP_IS_RESULT_BODY(body):
+            continue
         
-        response = requests.get(
-            DUCKDUCKGO_URL,
-            params=params,
-            headers=headers,
-            timeout=REQUEST_TIMEOUT
-        )
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        results = []
+        title = _XP_RESULT_TITLE(body) or "No title"
+        url = _XP_RESULT_URL(body)
+        snippet = _XP_RESULT_SNIPPET(body)
         
-        # Find all result divs with class "result__body"
-        result_bodies = soup.find_all("div", class_="result__body")
+        if url:  # Skip malformed results without a URL
+            results.append((title, url, snippet))
         
-        for body in result_bodies[:max_results]:
-            try:
-                # Extract title from .result__title a
-                title_elem = body.find("a", class_="result__title")
-                title = title_elem.get_text(strip=True) if title_elem else "No title"
-                
-                # Extract URL from .result__url
-                url_elem = body.find("a", class_="result__url")
-                url = url_elem.get_text(strip=True) if url_elem else ""
-                
-                # Extract snippet from .result__snippet
-                snippet_elem = body.find("a", class_="result__snippet")
-                snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                
-                if url:  # Only add if we got a URL
-                    results.append({
-                        "title": title,
-                        "url": url,
-                        "snippet": snippet
-                    })
-            except Exception:
-                # Skip malformed results
-                continue
-        
-        return results
+        seen += 1
+        if seen >= max_results:
+            break
+    
+    return results
+
+
+async def _search_duckduckgo(query: str, max_results: int) -> list:
+    """Query DuckDuckGo and parse the results page. Network errors propagate."""
+    params = {"q": query, "kl": "uk-en"}
+    
+    async with _get(DUCKDUCKGO_URL, params=params) as response:
+        response.raise_for_status()
+        body = await response.read()
+        charset = response.charset
     
-    except requests.exceptions.Timeout:
+    # Parse off the event loop so large pages don't stall other calls
+    return await asyncio.to_thread(_parse_duckduckgo_results, body, charset, max_results)
+
+
+async def search_duckduckgo(query: str, max_results: int = 5) -> list:
+    """
+    Search using DuckDuckGo lite HTML scraping (no API key required).
+    Returns list of (title, url, snippet) tuples.
+    
+    Network failures return []. Parsing errors propagate so a change in
+    DuckDuckGo's markup shows up as an error instead of silently empty results.
+    """
+    try:
+        key = ("duckduckgo", query.lower().strip(), max_results)
+        return await _cached(key, lambda: _search_duckduckgo(query, max_results))
+    
+    except asyncio.TimeoutError:
         return []
-    except requests.exceptions.RequestException:
+    except aiohttp.ClientError:
         # DuckDuckGo may block or be unavailable
         return []
-    except Exception:
-        return []
 
 
-def search_brave(query: str, max_results: int = 5) -> list:
+async def _search_brave(query: str, max_results: int) -> list:
+    """Query the Brave API and shape its results. Network errors propagate."""
+    params = {"q": query, "count": max_results}
+    
+    async with _get(BRAVE_API_URL, params=params, headers=_BRAVE_HEADERS) as response:
+        response.raise_for_status()
+        data = await response.json()
+    
+    results = []
+    
+    for result in data.get("web", {}).get("results", [])[:max_results]:
+        results.append((
+            result.get("title") or "",
+            result.get("url") or "",
+            result.get("description") or ""
+        ))
+    
+    return results
+
+
+async def search_brave(query: str, max_results: int = 5) -> tuple[str, list]:
     """
     Search using Brave API (requires BRAVE_API_KEY environment variable).
-    Returns list of {title, url, snippet} dicts.
+    
+    Returns:
+        (status, results): status is "ok", "empty", "rate_limited", "timeout"
+        or "error"; results is a list of (title, url, snippet) tuples.
     """
+    global _brave_blocked_until
+    if time.monotonic() < _brave_blocked_until:
+        return "rate_limited", []
+    
     try:
-        headers = {
-            "Accept": "application/json",
-            "X-Subscription-Token": BRAVE_API_KEY
-        }
-        params = {"q": query, "count": max_results}
-        
-        response = requests.get(
-            BRAVE_API_URL,
-            params=params,
-            headers=headers,
-            timeout=REQUEST_TIMEOUT
-        )
+        key = ("brave", query.lower().strip(), max_results)
+        results = await _cached(key, lambda: _search_brave(query, max_results))
+    
+    except asyncio.TimeoutError:
+        return "timeout", []
+    except aiohttp.ClientResponseError as e:
+        if e.status != 429:
+            return "error", []
+        retry_after = (e.headers or {}).get("Retry-After", "")
+        cooldown = float(retry_after) if retry_after.isdigit() else _BRAVE_RATE_LIMIT_COOLDOWN
+        _brave_blocked_until = time.monotonic() + cooldown
+        return "rate_limited", []
+    except Exception:
+        return "error", []
+    
+    return ("ok" if results else "empty"), results
+
+
+async def _first_non_empty(*searches) -> list:
+    """Run searches concurrently and return the first non-empty result list.
+    
+    The others are cancelled as soon as one succeeds. A search that raises
+    doesn't stop the rest; the first error is re-raised only if none of
+    them found anything. Returns [] if every search comes back empty.
+    """
+    tasks = [asyncio.create_task(search) for search in searches]
+    error = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                results = await next_done
+            except Exception as e:
+                error = error or e
+                continue
+            if results:
+                return results
+        if error is not None:
+            raise error
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _fetch_page(url: str, max_chars: int) -> str:
+    """Download url and return its visible text. Network errors propagate.
+    
+    Revalidates with If-None-Match / If-Modified-Since when the page was
+    fetched before, and reuses the previously extracted text on 304.
+    """
+    key = (url, max_chars)
+    cached = _HTTP_CACHE.get(key)
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
+    # Markup outweighs text many times over, but past this much HTML there's
+    # more than max_chars of text; stop downloading (and parsing) there
+    byte_limit = min(_MAX_PAGE_BYTES, max_chars * _PAGE_BYTES_PER_CHAR)
+    
+    async with _get(url, headers=headers) as response:
+        if response.status == 304 and cached is not None:
+            _HTTP_CACHE.move_to_end(key)
+            return cached[2]
         response.raise_for_status()
         
-        data = response.json()
-        results = []
-        
-        for result in data.get("web", [])[:max_results]:
-            results.append({
-                "title": result.get("title", ""),
-                "url": result.get("url", ""),
-                "snippet": result.get("description", "")
-            })
+        # Decide from the headers, before reading any of the body, whether
+        # this is something we can extract text from (not a PDF, video, ...)
+        content_type = response.content_type if "Content-Type" in response.headers else "text/html"
+        if content_type not in _TEXT_CONTENT_TYPES:
+            raise ValueError(f"Unsupported content type {content_type} for {url} (expected HTML or plain text)")
         
-        return results
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(16384):
+            body += chunk
+            if len(body) >= byte_limit:
+                break
+        charset = response.charset
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
     
-    except requests.exceptions.Timeout:
-        return []
-    except requests.exceptions.RequestException:
-        return []
-    except Exception:
-        return []
+    body = bytes(body[:byte_limit])
+    if content_type == "text/plain":
+        try:
+            decoded = body.decode(charset or "utf-8", errors="replace")
+        except LookupError:
+            # Unknown charset label in Content-Type
+            decoded = body.decode("utf-8", errors="replace")
+        text = _clean_text(decoded, max_chars)
+    elif len(body) >= _PROCESS_PARSE_THRESHOLD:
+        # Parse large HTML in a worker process
+        loop = asyncio.get_running_loop()
+        pool = _get_parse_pool()
+        try:
+            text = await loop.run_in_executor(pool, _extract_page_text, body, charset, max_chars)
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool next time
+            # and parse this page in a thread instead
+            _discard_parse_pool(pool)
+            text = await asyncio.to_thread(_extract_page_text, body, charset, max_chars)
+    else:
+        # Parse HTML and extract text off the event loop
+        text = await asyncio.to_thread(_extract_page_text, body, charset, max_chars)
+    
+    if etag or last_modified:
+        _HTTP_CACHE[key] = (etag, last_modified, text)
+        _HTTP_CACHE.move_to_end(key)
+        while len(_HTTP_CACHE) > _HTTP_CACHE_MAXSIZE:
+            _HTTP_CACHE.popitem(last=False)
+    else:
+        _HTTP_CACHE.pop(key, None)
+    return text
+
+
+def _extract_page_text(body: bytes, charset: str | None, max_chars: int) -> str:
+    """Parse an HTML page and return its visible text, truncated to max_chars."""
+    try:
+        parser = lxml.html.HTMLParser(encoding=charset)
+    except LookupError:
+        # Charset label lxml doesn't know; let it detect the encoding itself
+        parser = lxml.html.HTMLParser()
+    try:
+        tree = lxml.html.fromstring(body, parser=parser)
+    except etree.ParserError:
+        # Empty, whitespace-only or comment-only document
+        return ""
+    
+    # Remove script, style and noscript elements, keeping the text after them
+    etree.strip_elements(tree, "script", "style", "noscript", with_tail=False)
+    
+    return _clean_text(tree.text_content(), max_chars)
+
+
+def _clean_text(text: str, max_chars: int) -> str:
+    """Collapse whitespace and truncate to max_chars."""
+    text = _WS_RE.sub(' ', text).strip()
+    
+    # Truncate to max_chars
+    if len(text) > max_chars:
+        text = text[:max_chars] + "..."
+    
+    return text
+
+
+def _encode_results(results: list) -> str:
+    """Encode (title, url, snippet) tuples as a JSON list of objects."""
+    return "[" + ",".join(
+        f'{{"title":{_json_str(title)},"url":{_json_str(url)},"snippet":{_json_str(snippet)}}}'
+        for title, url, snippet in results
+    ) + "]"
 
 
 @server.list_tools()
@@ -156,7 +556,7 @@ async def list_tools():
     return [
         Tool(
             name="search_web",
-            description="Search the web for information. Uses Brave API if available, falls back to DuckDuckGo.",
+            description="Search the web for information. Queries Brave API (if available) and DuckDuckGo concurrently and returns the first results.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -214,31 +614,36 @@ async def call_tool(name: str, arguments: dict):
         if not query:
             return [TextContent(type="text", text="Error: query parameter is required")]
         
-        # Try Brave API first if available
-        if BRAVE_API_KEY:
-            results = search_brave(query, max_results)
-            if results:
-                return [TextContent(
-                    type="text",
-                    text=json.dumps(results, indent=2)
-                )]
+        brave_status = None
+        if _BRAVE_ENABLED:
+            async def brave_results():
+                nonlocal brave_status
+                brave_status, found = await search_brave(query, max_results)
+                return found
+            
+            # Race both engines rather than waiting out Brave before trying DDG;
+            # a rate-limited or failed Brave call drops out of the race at once
+            results = await _first_non_empty(
+                brave_results(),
+                search_duckduckgo(query, max_results)
+            )
+        else:
+            results = await search_duckduckgo(query, max_results)
         
-        # Fall back to DuckDuckGo
-        results = search_duckduckgo(query, max_results)
         if results:
             return [TextContent(
                 type="text",
-                text=json.dumps(results, indent=2)
+                text=_encode_results(results)
             )]
         
         # If both fail, return empty with message
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "results": [],
-                "message": "No results found or search service unavailable"
-            }, indent=2)
-        )]
+        response = {
+            "results": [],
+            "message": "No results found or search service unavailable"
+        }
+        if brave_status is not None:
+            response["brave_status"] = brave_status
+        return [TextContent(type="text", text=_dumps(response))]
     
     elif name == "fetch_page":
         url = arguments.get("url", "")
@@ -248,34 +653,12 @@ async def call_tool(name: str, arguments: dict):
             return [TextContent(type="text", text="Error: url parameter is required")]
         
         try:
-            headers = {"User-Agent": DEFAULT_USER_AGENT}
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=REQUEST_TIMEOUT
-            )
-            response.raise_for_status()
-            
-            # Parse HTML and extract text
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text and clean up whitespace
-            text = soup.get_text()
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            # Truncate to max_chars
-            if len(text) > max_chars:
-                text = text[:max_chars] + "..."
-            
+            text = await _cached(("page", url, max_chars), lambda: _fetch_page(url, max_chars))
             return [TextContent(type="text", text=text)]
         
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             return [TextContent(type="text", text=f"Error: Request timeout fetching {url}")]
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             return [TextContent(type="text", text=f"Error: Failed to fetch {url}: {str(e)}")]
         except Exception as e:
             return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -284,10 +667,10 @@ async def call_tool(name: str, arguments: dict):
         engine = get_active_search_engine()
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "engine": engine,
-                "brave_api_key_set": bool(BRAVE_API_KEY)
-            }, indent=2)
+                "brave_api_key_set": _BRAVE_ENABLED
+            })
         )]
     
     else:
@@ -296,8 +679,12 @@ async def call_tool(name: str, arguments: dict):
 
 async def main():
     """Main async entry point using correct MCP transport pattern."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await _close_session()
+        _shutdown_parse_pool()
 
 
 if __name__ == "__main__":